@@ -8,13 +8,14 @@ import numpy as np
 import sys
 import math
 import random
+import functools
 
 # ==================== CONFIGURATION ====================
-GBA_WIDTH, GBA_HEIGHT = 240, 160
-SCALE = 3
-SCREEN_SIZE = (GBA_WIDTH * SCALE, GBA_HEIGHT * SCALE)
+GBA_WIDTH, GBA_HEIGHT = 240, 160   # native resolution; SDL upscales the window
 TILE_SIZE = 16
 FPS = 60
+ENEMY_SPEED = 1
+LOOP_DURATION = 4.0   # seconds per procedural music loop
 
 COLOR_BLACK = (0, 0, 0)
 COLOR_WHITE = (255, 255, 255)
@@ -27,6 +28,52 @@ COLOR_CAT = (210, 180, 140)
 COLOR_ENEMY = (255, 100, 100)
 COLOR_WALL = (0, 0, 0)
 
+# ==================== WAVETABLES ====================
+# One period of each Famicom waveform, indexed by the top 10 bits of a
+# 32-bit phase accumulator (direct digital synthesis).
+LUT_BITS = 10
+LUT_SIZE = 1 << LUT_BITS
+
+# Pure sine for the drum voices, indexed by the top 12 bits of the phase
+SINE_LUT_BITS = 12
+SINE_LUT = (np.sin(np.linspace(0, 2 * np.pi, 1 << SINE_LUT_BITS, endpoint=False))
+            * 32767).astype(np.int16)
+
+
+@functools.lru_cache(maxsize=None)
+def wavetable(kind, harmonics, duty=0.5):
+    """
+    Build one band-limited int16 period of a 'pulse' (high while phase < duty)
+    or 'triangle' wave.  The Fourier series up to `harmonics` is written
+    straight into the spectrum and turned into samples with a single
+    inverse real FFT, so notes played from the table do not alias.
+    """
+    k = np.arange(1, harmonics + 1)
+    spectrum = np.zeros(LUT_SIZE // 2 + 1, dtype=np.complex128)
+    if kind == 'pulse':
+        angle = 2 * np.pi * k * duty
+        spectrum[k] = (np.sin(angle) - 1j * (1 - np.cos(angle))) / (np.pi * k)
+    else:  # triangle: odd cosine harmonics falling off as 1/k^2
+        odd = k[k % 2 == 1]
+        spectrum[odd] = 4 / (np.pi * odd) ** 2
+    table = np.fft.irfft(spectrum, LUT_SIZE)
+    table *= 32767 / np.abs(table).max()
+    return table.astype(np.int16)
+
+# ==================== PCM FINALIZER ====================
+def _finalize(wave, out, peak, dither):
+    """
+    Quantize a mono float32 wave into the integer buffer out: add TPDF dither
+    (in LSBs), round to nearest and clip to +/-peak (127 for 8-bit, 32767
+    for 16-bit).
+    """
+    scaled = wave * np.float32(peak)
+    scaled += dither
+    scaled += 0.5
+    np.floor(scaled, out=scaled)
+    np.clip(scaled, -peak, peak, out=scaled)
+    out[:] = scaled
+
 # ==================== EMBEDDED LEVEL DATA ====================
 LEVELS = {
     "ruins": [
@@ -103,166 +150,177 @@ LEVELS = {
     ]
 }
 
-# ==================== FAMICOM SOUND MANAGER ====================
-class SoundManager:
-    """Procedural Famicom‑style music generator – no external files."""
-    def __init__(self):
-        self.mixer_available = True
-        self.music_channel = None
-        self.proc_channels = []
+# ==================== FAMICOM SYNTHESIZER ====================
+class FamicomSynth:
+    """
+    Pure-NumPy Famicom loop synthesizer.  Holds no pygame state;
+    SoundManager turns its float32 output into Sounds.
+    """
+    _DRUM_TYPES = ('kick', 'snare', 'hat')
 
-        try:
-            pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
-            self.music_channel = pygame.mixer.Channel(0)      # not used (fileless)
-            self.proc_channels = [pygame.mixer.Channel(i) for i in range(1, 4)]
-        except Exception as e:
-            print(f"Warning: Could not initialize mixer ({e}). Sound disabled.")
-            self.mixer_available = False
-
-        self.current_level = None
-        self.route = "pacifist"
-        self.target_volume = 0.5
-        self.current_volume = 0.5
-        self.speed = 0.0
-        self.enemy_near = False
-
-        # Procedural storage
-        self.proc_sounds = {}
-        self.proc_target_volumes = [0.5, 0.5, 0.5]
-        self.proc_current_volumes = [0.0, 0.0, 0.0]
+    def __init__(self, sample_rate):
+        self.sample_rate = sample_rate
+        self._wave_cache = {}   # (kind, *params) -> mono float32 tone
+        self._noise_bufs = {}   # length -> reusable float32 scratch buffer
+        self._decay_cache = {}  # (samples, rate) -> exp(-rate * t) envelope
 
     # ---------- Famicom waveform generators ----------
-    def _pulse_wave(self, freq, duration, duty, volume):
+    def _cached(self, key, build):
+        """Return the mono tone stored under key, synthesizing it on first use."""
+        wave = self._wave_cache.get(key)
+        if wave is None:
+            wave = build()
+            if wave is not None:
+                self._wave_cache[key] = wave
+        return wave
+
+    def _dds(self, lut, freq, duration, volume):
         """
-        Generate a pulse wave with given duty cycle (0.0–1.0).
+        Play one period table at freq with a uint32 phase accumulator and
+        return a mono float32 array with a short click-free fade at each end.
+        """
+        sample_rate = self.sample_rate
+        samples = int(duration * sample_rate)
+        if samples <= 0:
+            return None
+        step = np.uint32(int(freq * 2**32 / sample_rate) & 0xFFFFFFFF)
+        phase = np.arange(samples, dtype=np.uint32) * step
+        wave = lut[phase >> (32 - LUT_BITS)].astype(np.float32)
+        wave *= volume / 32767
+        fade = min(int(0.005 * sample_rate), samples // 2)
+        if fade > 0:
+            ramp = np.linspace(0, 1, fade, dtype=np.float32)
+            wave[:fade] *= ramp
+            wave[-fade:] *= ramp[::-1]
+        return wave
+
+    def _uniform(self, samples, rng):
+        """
+        Fill a reused float32 scratch buffer with uniform noise in [-1, 1)
+        drawn from rng.  The buffer is overwritten by the next call, so
+        callers must copy it.
+        """
+        buf = self._noise_bufs.get(samples)
+        if buf is None:
+            buf = self._noise_bufs[samples] = np.empty(samples, dtype=np.float32)
+        rng.random(dtype=np.float32, out=buf)
+        buf *= 2
+        buf -= 1
+        return buf
+
+    def _decay(self, samples, rate):
+        """Exponential decay envelope exp(-rate * t), cached per length and rate."""
+        key = (samples, rate)
+        env = self._decay_cache.get(key)
+        if env is None:
+            t = np.arange(samples, dtype=np.float32) * (1.0 / self.sample_rate)
+            env = self._decay_cache[key] = np.exp(-rate * t)
+        return env
+
+    def _sine(self, phase):
+        """Look up SINE_LUT for a uint32 phase accumulator."""
+        return SINE_LUT[phase >> (32 - SINE_LUT_BITS)]
+
+    def _harmonics(self, freq):
+        """Number of harmonics of freq that fit below the Nyquist frequency."""
+        return int(min(max(self.sample_rate / 2 / freq, 1), LUT_SIZE // 2 - 1))
+
+    def _pulse_wave_mono(self, freq, duration, duty, volume):
+        """
+        Generate a pulse wave with given duty cycle.
         duty = 0.125, 0.25, 0.5, 0.75  (typical NES values)
+        Returns a mono float32 array in [-1, 1].
         """
         try:
-            sample_rate = pygame.mixer.get_init()[0]
-            samples = int(duration * sample_rate)
-            if samples <= 0:
-                return None
-            t = np.linspace(0, duration, samples, endpoint=False)
-            # Square wave with duty cycle
-            wave = np.where((t * freq) % 1.0 < duty, 1.0, -1.0)
-            # Simple volume envelope (quick fade in/out to avoid clicks)
-            envelope = np.ones(samples)
-            fade = int(0.005 * sample_rate)
-            if fade > 0:
-                envelope[:fade] = np.linspace(0, 1, fade)
-                envelope[-fade:] = np.linspace(1, 0, fade)
-            wave *= envelope * volume
-            wave = (wave * 32767).astype(np.int16)
-            stereo = np.repeat(wave.reshape(-1, 1), 2, axis=1)
-            return pygame.sndarray.make_sound(stereo)
+            return self._cached(('pulse', freq, duration, duty, volume),
+                                lambda: self._dds(wavetable('pulse', self._harmonics(freq), duty),
+                                                  freq, duration, volume))
         except Exception:
             return None
 
-    def _triangle_wave(self, freq, duration, volume):
-        """Generate a triangle wave (clean, hollow sound)."""
+    def _triangle_wave_mono(self, freq, duration, volume):
+        """Generate a triangle wave (clean, hollow sound) as a mono float32 array."""
         try:
-            sample_rate = pygame.mixer.get_init()[0]
-            samples = int(duration * sample_rate)
-            if samples <= 0:
-                return None
-            t = np.linspace(0, duration, samples, endpoint=False)
-            # Triangle wave: 2 * abs(2*(t*freq - floor(t*freq+0.5))) - 1
-            phase = t * freq - np.floor(t * freq)
-            wave = 2 * np.abs(2 * phase - 1) - 1
-            envelope = np.ones(samples)
-            fade = int(0.005 * sample_rate)
-            if fade > 0:
-                envelope[:fade] = np.linspace(0, 1, fade)
-                envelope[-fade:] = np.linspace(1, 0, fade)
-            wave *= envelope * volume
-            wave = (wave * 32767).astype(np.int16)
-            stereo = np.repeat(wave.reshape(-1, 1), 2, axis=1)
-            return pygame.sndarray.make_sound(stereo)
+            return self._cached(('triangle', freq, duration, volume),
+                                lambda: self._dds(wavetable('triangle', self._harmonics(freq)),
+                                                  freq, duration, volume))
         except Exception:
             return None
 
-    def _noise(self, duration, volume, mode='white'):
-        """Generate noise (for drums/percussion)."""
-        try:
-            sample_rate = pygame.mixer.get_init()[0]
-            samples = int(duration * sample_rate)
-            if samples <= 0:
-                return None
-            if mode == 'white':
-                wave = np.random.uniform(-1, 1, samples)
-            else:  # 'periodic' – NES noise can be periodic
-                # simple approximation: random but with a slight pattern
-                wave = np.random.uniform(-1, 1, samples)
-                wave[::2] *= 0.7   # add some texture
-            envelope = np.ones(samples)
-            fade = int(0.003 * sample_rate)
-            if fade > 0:
-                envelope[:fade] = np.linspace(0, 1, fade)
-                envelope[-fade:] = np.linspace(1, 0, fade)
-            wave *= envelope * volume
-            wave = (wave * 32767).astype(np.int16)
-            stereo = np.repeat(wave.reshape(-1, 1), 2, axis=1)
-            return pygame.sndarray.make_sound(stereo)
-        except Exception:
-            return None
+    def _noise_mono(self, samples, volume, rng, mode='white'):
+        """Generate noise (for drums/percussion) as a mono float32 array."""
+        wave = self._uniform(samples, rng) * np.float32(volume)
+        if mode != 'white':  # 'periodic' – NES noise can be periodic
+            # simple approximation: random but with a slight pattern
+            wave[::2] *= 0.7   # add some texture
+        fade = min(int(0.003 * self.sample_rate), samples // 2)
+        if fade > 0:
+            ramp = np.linspace(0, 1, fade, dtype=np.float32)
+            wave[:fade] *= ramp
+            wave[-fade:] *= ramp[::-1]
+        return wave
 
     # ---------- Famicom drum kit ----------
-    def _drum(self, duration, type='kick', volume=0.5):
-        """Create a drum sound using noise and triangle/pulse."""
-        if type == 'kick':
-            # Kick: short low pulse + noise decay
-            try:
-                sample_rate = pygame.mixer.get_init()[0]
-                samples = int(duration * sample_rate)
-                if samples <= 0:
-                    return None
-                t = np.linspace(0, duration, samples, endpoint=False)
-                # fast descending pitch on triangle
-                pitch = 120 * np.exp(-t * 20)
-                kick_tone = np.sin(2 * np.pi * pitch * t) * np.exp(-t * 20)
+    def _drum_mono(self, duration, type='kick', volume=0.5):
+        """Create a drum sound using noise and triangle/pulse (mono float32)."""
+        if type not in self._DRUM_TYPES:
+            return None
+        sample_rate = self.sample_rate
+        samples = int(duration * sample_rate)
+        if samples <= 0:
+            return None
+        # Each voice seeds its own noise, so it does not depend on build order
+        rng = np.random.default_rng([42, samples, self._DRUM_TYPES.index(type)])   # PCG64
+
+        try:
+            if type == 'kick':
+                # Kick: short low pulse + noise decay
+                # fast descending pitch, integrated into the phase accumulator
+                decay = self._decay(samples, 20)
+                step = (decay * (120 * 2**32 / sample_rate)).astype(np.uint32)
+                kick_tone = self._sine(np.cumsum(step, dtype=np.uint32)) * (decay / 32767)
                 # add a little noise slap
-                noise = np.random.uniform(-0.3, 0.3, samples) * np.exp(-t * 30)
+                noise = self._uniform(samples, rng) * 0.3 * self._decay(samples, 30)
                 wave = kick_tone + noise
-                wave *= volume
-                wave = (wave * 32767).astype(np.int16)
-                stereo = np.repeat(wave.reshape(-1, 1), 2, axis=1)
-                return pygame.sndarray.make_sound(stereo)
-            except Exception:
-                return None
-        elif type == 'snare':
-            # Snare: mix of noise and a high tone
-            try:
-                sample_rate = pygame.mixer.get_init()[0]
-                samples = int(duration * sample_rate)
-                if samples <= 0:
-                    return None
-                t = np.linspace(0, duration, samples, endpoint=False)
-                noise = np.random.uniform(-1, 1, samples) * np.exp(-t * 20)
-                tone = np.sin(2 * np.pi * 180 * t) * np.exp(-t * 15)
+            elif type == 'snare':
+                # Snare: mix of noise and a high tone
+                noise = self._uniform(samples, rng) * self._decay(samples, 20)
+                step = np.uint32(int(180 * 2**32 / sample_rate))
+                phase = np.arange(samples, dtype=np.uint32) * step
+                tone = self._sine(phase) * (self._decay(samples, 15) / 32767)
                 wave = 0.6 * noise + 0.4 * tone
-                wave *= volume
-                wave = (wave * 32767).astype(np.int16)
-                stereo = np.repeat(wave.reshape(-1, 1), 2, axis=1)
-                return pygame.sndarray.make_sound(stereo)
-            except Exception:
-                return None
-        elif type == 'hat':
-            # Hi‑hat: short noise burst
-            return self._noise(duration, volume * 0.7, mode='white')
-        else:
+            else:
+                # Hi‑hat: short noise burst
+                return self._noise_mono(samples, volume * 0.7, rng, mode='white')
+            wave *= volume
+            return wave
+        except Exception:
             return None
 
     # ---------- Procedural loop generation ----------
-    def _generate_famicom_loop(self, level_name, duration=4.0):
+    def _sequence(self, tones, samples_per_beat, total_samples):
+        """
+        Lay one tone per beat into a preallocated buffer, cycling through
+        the pattern until total_samples are filled.  None marks a rest.
+        """
+        out = np.empty(total_samples, dtype=np.float32)
+        for i, start in enumerate(range(0, total_samples, samples_per_beat)):
+            end = min(start + samples_per_beat, total_samples)
+            tone = tones[i % len(tones)]
+            if tone is None:
+                out[start:end] = 0.0
+            else:
+                np.copyto(out[start:end], tone[:end - start])
+        return out
+
+    def generate_loop(self, level_name, duration=LOOP_DURATION):
         """
         Create a 4‑second loop using Famicom channels:
         - Bass: triangle wave
         - Melody: pulse wave (50% duty)
         - Drums: noise + pulse for kick/snare
+        The three channels are premixed into a single mono float32 array.
         """
-        if not self.mixer_available:
-            return None
-
         try:
             # Define musical parameters (note sequences reminiscent of UNDERTALE)
             if level_name == "ruins":
@@ -303,97 +361,134 @@ class SoundManager:
                 duty = 0.5
 
             beat_duration = 60.0 / tempo
-            sample_rate = pygame.mixer.get_init()[0]
+            sample_rate = self.sample_rate
             samples_per_beat = int(beat_duration * sample_rate)
-            if samples_per_beat <= 0:
+            total_samples = int(duration * sample_rate)
+            if samples_per_beat <= 0 or total_samples <= 0:
                 return None
 
             # ---------- Bass (triangle) ----------
-            bass_pattern = []
+            bass_tones = []
             for freq in bass_freqs:
                 if freq == 0:
-                    bass_pattern.append(np.zeros(samples_per_beat))
-                else:
-                    tone = self._triangle_wave(freq, beat_duration, volume=0.5)
-                    if tone is None:
-                        return None
-                    arr = pygame.sndarray.array(tone)
-                    if arr.size == 0:
-                        return None
-                    bass_pattern.append(arr[:, 0])   # take mono
-            bass_array = np.concatenate(bass_pattern)
-            repeats = int(duration / (len(bass_freqs) * beat_duration))
-            if repeats > 0:
-                bass_array = np.tile(bass_array, repeats)
+                    bass_tones.append(None)
+                    continue
+                tone = self._triangle_wave_mono(freq, beat_duration, volume=1.0)
+                if tone is None:
+                    return None
+                bass_tones.append(tone)
+            bass_array = self._sequence(bass_tones, samples_per_beat, total_samples)
 
             # ---------- Melody (pulse) ----------
-            melody_pattern = []
+            melody_tones = []
             for note in melody_notes:
                 if note == 0:
-                    melody_pattern.append(np.zeros(samples_per_beat))
-                else:
-                    tone = self._pulse_wave(note, beat_duration, duty, volume=0.4)
-                    if tone is None:
-                        return None
-                    arr = pygame.sndarray.array(tone)
-                    if arr.size == 0:
-                        return None
-                    melody_pattern.append(arr[:, 0])
-            melody_array = np.concatenate(melody_pattern)
-            repeats = int(duration / (len(melody_notes) * beat_duration))
-            if repeats > 0:
-                melody_array = np.tile(melody_array, repeats)
-
-            # ---------- Drums (noise + pulse) ----------
-            drums_pattern = []
-            for i in range(16):   # 16 beats per pattern
-                if i % 4 == 0:    # kick on quarter notes
-                    drum = self._drum(beat_duration, 'kick', 0.6)
-                elif i % 8 == 6:  # snare on off-beats
-                    drum = self._drum(beat_duration, 'snare', 0.5)
-                elif i % 2 == 1:  # hi-hat on eighth notes
-                    drum = self._drum(beat_duration, 'hat', 0.3)
-                else:
-                    drums_pattern.append(np.zeros(samples_per_beat))
+                    melody_tones.append(None)
                     continue
-                if drum is None:
+                tone = self._pulse_wave_mono(note, beat_duration, duty, volume=1.0)
+                if tone is None:
                     return None
-                arr = pygame.sndarray.array(drum)
-                if arr.size == 0:
-                    return None
-                drums_pattern.append(arr[:, 0])
-            drums_array = np.concatenate(drums_pattern)
-            repeats = int(duration / (16 * beat_duration))
-            if repeats > 0:
-                drums_array = np.tile(drums_array, repeats)
-
-            # Trim to exact duration
-            target_samples = int(duration * sample_rate)
-            if target_samples <= 0:
+                melody_tones.append(tone)
+            melody_array = self._sequence(melody_tones, samples_per_beat, total_samples)
+
+            # ---------- Drums (noise + pulse) ----------
+            kick = self._drum_mono(beat_duration, 'kick', 0.6)
+            snare = self._drum_mono(beat_duration, 'snare', 0.5)
+            hat = self._drum_mono(beat_duration, 'hat', 0.3)
+            if kick is None or snare is None or hat is None:
                 return None
-            bass_array = bass_array[:target_samples]
-            melody_array = melody_array[:target_samples]
-            drums_array = drums_array[:target_samples]
-
-            # Convert mono arrays to stereo sounds
-            def to_stereo(mono):
-                try:
-                    if mono.size == 0:
-                        return None
-                    stereo = np.repeat(mono.reshape(-1, 1), 2, axis=1)
-                    return pygame.sndarray.make_sound(stereo.astype(np.int16))
-                except Exception:
-                    return None
+            # 16 beats per pattern, one row per beat
+            drums_pattern = np.zeros((16, samples_per_beat), dtype=np.float32)
+            drums_pattern[0::4] = kick      # kick on quarter notes
+            drums_pattern[6::8] = snare     # snare on off-beats
+            drums_pattern[1::2] = hat       # hi-hat on eighth notes
+            drums_array = np.resize(drums_pattern.ravel(), total_samples)
+
+            # ---------- Mix down ----------
+            mix = bass_array
+            mix *= 0.5
+            mix += 0.4 * melody_array
+            mix += 0.6 * drums_array
+            np.clip(mix, -1.0, 1.0, out=mix)
+            return mix
 
-            bass_snd = to_stereo(bass_array)
-            melody_snd = to_stereo(melody_array)
-            drums_snd = to_stereo(drums_array)
+        except Exception as e:
+            print(f"Famicom generation failed: {e}")
+            return None
 
-            if bass_snd is None or melody_snd is None or drums_snd is None:
-                return None
 
-            return (bass_snd, melody_snd, drums_snd)
+# ==================== FAMICOM SOUND MANAGER ====================
+class SoundManager:
+    """Procedural Famicom‑style music generator – no external files."""
+    def __init__(self):
+        self.mixer_available = True
+        self.music_channel = None
+        self.proc_channel = None
+
+        try:
+            # pygame.init() may already have opened the mixer with its
+            # defaults; reopen it so the 8-bit mono format below takes effect.
+            # The Famicom loops carry no stereo content, and 11025 Hz leaves
+            # headroom above the highest melody note.
+            pygame.mixer.quit()
+            pygame.mixer.init(frequency=11025, size=-8, channels=1, buffer=512)
+            self.music_channel = pygame.mixer.Channel(0)      # not used (fileless)
+            self.proc_channel = pygame.mixer.Channel(1)
+        except Exception as e:
+            print(f"Warning: Could not initialize mixer ({e}). Sound disabled.")
+            self.mixer_available = False
+
+        self.current_level = None
+        self.route = "pacifist"
+        self.target_volume = 0.5
+        self.current_volume = 0.5
+        self.speed = 0.0
+        self.enemy_near = False
 
+        # Procedural storage
+        self.proc_sounds = {}
+        self.proc_target_volume = 0.5
+        self.proc_current_volume = 0.0
+        self._dither_rng = np.random.default_rng(0)   # PCG64
+        self._synth = None
+        if self.mixer_available:
+            self._synth = FamicomSynth(pygame.mixer.get_init()[0])
+            # Synthesis takes a few ms per level: pay it all up front so
+            # entering a level never hitches
+            for name in LEVELS:
+                loop = self._generate_famicom_loop(name)
+                if loop is not None:
+                    self.proc_sounds[name] = loop
+
+    def _to_sound(self, mono):
+        """Quantize a mono float32 track and wrap it as a Sound in the mixer's format."""
+        if mono.size == 0:
+            return None
+        _, size, channels = pygame.mixer.get_init()
+        dtype = np.int8 if abs(size) == 8 else np.int16
+        peak = np.iinfo(dtype).max
+        # Triangular (TPDF) dither hides the 8-bit quantization error as noise
+        rng = self._dither_rng
+        dither = rng.random(mono.size, dtype=np.float32)
+        dither -= rng.random(mono.size, dtype=np.float32)
+        pcm = np.empty(mono.size, dtype=dtype)
+        _finalize(mono, pcm, peak, dither)
+        if channels > 1:
+            # The device refused mono; duplicate into every channel
+            pcm = np.column_stack([pcm] * channels)
+        return pygame.sndarray.make_sound(pcm)
+
+    def _generate_famicom_loop(self, level_name):
+        """Synthesize the level's premixed loop and wrap it as a looping Sound."""
+        if not self.mixer_available:
+            return None
+
+        mix = self._synth.generate_loop(level_name)
+        if mix is None:
+            return None
+
+        try:
+            return self._to_sound(mix)
         except Exception as e:
             print(f"Famicom generation failed: {e}")
             return None
@@ -406,36 +501,32 @@ class SoundManager:
             return
         self.current_level = level_name
 
-        # Stop any currently playing sounds
-        for ch in self.proc_channels:
-            try:
-                ch.stop()
-            except:
-                pass
+        # Stop any currently playing sound
+        try:
+            self.proc_channel.stop()
+        except:
+            pass
 
         # Generate or retrieve cached loop
         if level_name in self.proc_sounds:
-            loops = self.proc_sounds[level_name]
+            loop = self.proc_sounds[level_name]
         else:
-            loops = self._generate_famicom_loop(level_name, duration=4.0)
-            if loops is None:
+            loop = self._generate_famicom_loop(level_name)
+            if loop is None:
                 print("Famicom generation failed; disabling sound.")
                 self.mixer_available = False
                 return
-            self.proc_sounds[level_name] = loops
+            self.proc_sounds[level_name] = loop
 
-        bass, melody, drums = loops
         try:
-            self.proc_channels[0].play(bass, loops=-1)
-            self.proc_channels[1].play(melody, loops=-1)
-            self.proc_channels[2].play(drums, loops=-1)
+            self.proc_channel.play(loop, loops=-1)
         except Exception as e:
             print(f"Failed to play procedural music: {e}")
             self.mixer_available = False
             return
 
-        self.proc_target_volumes = [0.5, 0.5, 0.5]
-        self.proc_current_volumes = [0.0, 0.0, 0.0]
+        self.proc_target_volume = 0.5
+        self.proc_current_volume = 0.0
 
     def set_route(self, route):
         if route != self.route:
@@ -454,16 +545,22 @@ class SoundManager:
             base_vol *= 0.5
         self.target_volume = base_vol
 
-        for i in range(3):
-            diff = self.target_volume - self.proc_current_volumes[i]
-            self.proc_current_volumes[i] += diff * 0.1
-            if i < len(self.proc_channels):
-                try:
-                    self.proc_channels[i].set_volume(self.proc_current_volumes[i])
-                except:
-                    pass
+        diff = self.target_volume - self.proc_current_volume
+        self.proc_current_volume += diff * 0.1
+        try:
+            self.proc_channel.set_volume(self.proc_current_volume)
+        except:
+            pass
+
+# ==================== GAME OBJECTS ====================
+def grid_collides(grid, rect):
+    """Return True if rect overlaps any solid tile of a wall occupancy grid."""
+    tx0 = max(rect.left // TILE_SIZE, 0)
+    ty0 = max(rect.top // TILE_SIZE, 0)
+    tx1 = (rect.right - 1) // TILE_SIZE
+    ty1 = (rect.bottom - 1) // TILE_SIZE
+    return bool(grid[ty0:ty1 + 1, tx0:tx1 + 1].any())
 
-# ==================== GAME OBJECTS (unchanged) ====================
 class Cat(pygame.sprite.Sprite):
     def __init__(self, x, y):
         super().__init__()
@@ -477,55 +574,31 @@ class Cat(pygame.sprite.Sprite):
         self.vx = self.vy = 0
         self.speed = 3
 
-    def update(self, walls):
+    def update(self, grid):
         self.rect.x += self.vx
-        self.collide(self.vx, 0, walls)
+        self.collide(self.vx, 0, grid)
         self.rect.y += self.vy
-        self.collide(0, self.vy, walls)
-
-    def collide(self, dx, dy, walls):
-        for wall in walls:
-            if self.rect.colliderect(wall.rect):
-                if dx > 0:
-                    self.rect.right = wall.rect.left
-                if dx < 0:
-                    self.rect.left = wall.rect.right
-                if dy > 0:
-                    self.rect.bottom = wall.rect.top
-                if dy < 0:
-                    self.rect.top = wall.rect.bottom
-
-class Wall(pygame.sprite.Sprite):
-    def __init__(self, x, y):
-        super().__init__()
-        self.image = pygame.Surface((TILE_SIZE, TILE_SIZE))
-        self.image.fill(COLOR_BLACK)
-        self.rect = self.image.get_rect(topleft=(x, y))
+        self.collide(0, self.vy, grid)
 
-class Enemy(pygame.sprite.Sprite):
-    def __init__(self, x, y, level):
-        super().__init__()
-        self.image = pygame.Surface((TILE_SIZE, TILE_SIZE))
-        self.image.fill(COLOR_ENEMY)
-        self.rect = self.image.get_rect(topleft=(x, y))
-        self.direction = 1
-        self.speed = 1
-        self.level = level
-
-    def update(self, walls):
-        self.rect.x += self.speed * self.direction
-        if self.rect.left <= 0 or self.rect.right >= GBA_WIDTH:
-            self.direction *= -1
-        for wall in walls:
-            if self.rect.colliderect(wall.rect):
-                self.direction *= -1
-                self.rect.x += self.speed * self.direction
-
-# ==================== MAIN GAME (unchanged) ====================
+    def collide(self, dx, dy, grid):
+        if not grid_collides(grid, self.rect):
+            return
+        # Snap back to the edge of the tile we moved into
+        if dx > 0:
+            self.rect.right = (self.rect.right - 1) // TILE_SIZE * TILE_SIZE
+        if dx < 0:
+            self.rect.left = (self.rect.left // TILE_SIZE + 1) * TILE_SIZE
+        if dy > 0:
+            self.rect.bottom = (self.rect.bottom - 1) // TILE_SIZE * TILE_SIZE
+        if dy < 0:
+            self.rect.top = (self.rect.top // TILE_SIZE + 1) * TILE_SIZE
+
+# ==================== MAIN GAME ====================
 class Game:
     def __init__(self):
         pygame.init()
-        self.screen = pygame.display.set_mode(SCREEN_SIZE)
+        self.screen = pygame.display.set_mode((GBA_WIDTH, GBA_HEIGHT),
+                                              pygame.SCALED | pygame.DOUBLEBUF)
         pygame.display.set_caption("Cat's Undertale (Famicom OST)")
         self.clock = pygame.time.Clock()
         self.running = True
@@ -534,26 +607,54 @@ class Game:
         self.current_level_idx = 0
         self.level = self.level_names[self.current_level_idx]
 
+        # Pre-rendered tiles, blitted instead of drawn each frame
+        self._wall_surf = pygame.Surface((TILE_SIZE, TILE_SIZE))
+        self._wall_surf.fill(COLOR_WALL)
+        self._enemy_surf = pygame.Surface((TILE_SIZE, TILE_SIZE))
+        self._enemy_surf.fill(COLOR_ENEMY)
+        self._bg = None         # level background with walls baked in
+
+        # Walls and enemies are stored as arrays (top-left pixel per row)
         self.player = None
-        self.walls = pygame.sprite.Group()
-        self.enemies = pygame.sprite.Group()
+        self.wall_xy = np.zeros((0, 2), dtype=np.int32)
+        self.wall_grid = np.zeros((0, 0), dtype=np.uint8)
+        self.enemy_xy = np.zeros((0, 2), dtype=np.int32)
+        self.enemy_dir = np.zeros(0, dtype=np.int8)
         self.load_level(self.level)
 
         self.sound = SoundManager()
         self.sound.load_level(self.level)
 
     def load_level(self, level_name):
-        self.walls.empty()
-        self.enemies.empty()
+        if level_name == "ruins":
+            bg_color = COLOR_RUINS
+        elif level_name == "snowdin":
+            bg_color = COLOR_SNOW
+        elif level_name == "waterfall":
+            bg_color = COLOR_WATER
+        elif level_name == "hotland":
+            bg_color = COLOR_HOTLAND
+        elif level_name == "core":
+            bg_color = COLOR_CORE
+        else:
+            bg_color = COLOR_CORE
+
         level_data = LEVELS[level_name]
-        for row, line in enumerate(level_data):
-            for col, char in enumerate(line):
-                x = col * TILE_SIZE
-                y = row * TILE_SIZE
-                if char == '#':
-                    self.walls.add(Wall(x, y))
-                elif char == 'E':
-                    self.enemies.add(Enemy(x, y, level_name))
+        self.wall_xy = np.array([(col * TILE_SIZE, row * TILE_SIZE)
+                                 for row, line in enumerate(level_data)
+                                 for col, char in enumerate(line) if char == '#'],
+                                dtype=np.int32).reshape(-1, 2)
+        self.wall_grid = np.zeros((len(level_data), len(level_data[0])), dtype=np.uint8)
+        self.wall_grid[self.wall_xy[:, 1] // TILE_SIZE, self.wall_xy[:, 0] // TILE_SIZE] = 1
+        self.enemy_xy = np.array([(col * TILE_SIZE, row * TILE_SIZE)
+                                  for row, line in enumerate(level_data)
+                                  for col, char in enumerate(line) if char == 'E'],
+                                 dtype=np.int32).reshape(-1, 2)
+        self.enemy_dir = np.ones(len(self.enemy_xy), dtype=np.int8)
+        # Walls are static: bake them into the level background once
+        self._bg = pygame.Surface((GBA_WIDTH, GBA_HEIGHT)).convert()
+        self._bg.fill(bg_color)
+        self._bg.blits([(self._wall_surf, pos) for pos in self.wall_xy.tolist()], doreturn=0)
         for row, line in enumerate(level_data):
             for col, char in enumerate(line):
                 if char == '.':
@@ -597,47 +698,38 @@ class Game:
                 if event.key in (pygame.K_UP, pygame.K_DOWN):
                     self.player.vy = 0
 
+    def update_enemies(self):
+        """Patrol all enemies horizontally in one step, bouncing off the screen edges and walls."""
+        xy, direction = self.enemy_xy, self.enemy_dir
+        xy[:, 0] += ENEMY_SPEED * direction
+        edge = (xy[:, 0] <= 0) | (xy[:, 0] + TILE_SIZE >= GBA_WIDTH)
+        direction[edge] *= -1
+
+        # Probe the wall grid under the four corners of every enemy at once
+        grid = self.wall_grid
+        rows, cols = grid.shape
+        tx0 = np.clip(xy[:, 0] // TILE_SIZE, 0, cols - 1)
+        tx1 = np.clip((xy[:, 0] + TILE_SIZE - 1) // TILE_SIZE, 0, cols - 1)
+        ty0 = np.clip(xy[:, 1] // TILE_SIZE, 0, rows - 1)
+        ty1 = np.clip((xy[:, 1] + TILE_SIZE - 1) // TILE_SIZE, 0, rows - 1)
+        hit = (grid[ty0, tx0] | grid[ty0, tx1] | grid[ty1, tx0] | grid[ty1, tx1]).astype(bool)
+        direction[hit] *= -1
+        xy[hit, 0] += ENEMY_SPEED * direction[hit]
+
     def update(self, dt):
-        self.player.update(self.walls)
-        self.enemies.update(self.walls)
+        self.player.update(self.wall_grid)
+        self.update_enemies()
 
-        enemy_near = any(abs(e.rect.centerx - self.player.rect.centerx) < 48 and
-                         abs(e.rect.centery - self.player.rect.centery) < 48
-                         for e in self.enemies)
+        delta = np.abs(self.enemy_xy + TILE_SIZE // 2 - self.player.rect.center)
+        enemy_near = bool(((delta[:, 0] < 48) & (delta[:, 1] < 48)).any())
         speed_mag = math.hypot(self.player.vx, self.player.vy)
 
         self.sound.update(speed_mag, enemy_near)
 
     def draw(self):
-        if self.level == "ruins":
-            bg_color = COLOR_RUINS
-        elif self.level == "snowdin":
-            bg_color = COLOR_SNOW
-        elif self.level == "waterfall":
-            bg_color = COLOR_WATER
-        elif self.level == "hotland":
-            bg_color = COLOR_HOTLAND
-        elif self.level == "core":
-            bg_color = COLOR_CORE
-        else:
-            bg_color = COLOR_CORE
-
-        self.screen.fill(bg_color)
-
-        scale = SCALE
-        for sprite in self.walls:
-            scaled_rect = pygame.Rect(sprite.rect.x * scale, sprite.rect.y * scale,
-                                      TILE_SIZE * scale, TILE_SIZE * scale)
-            pygame.draw.rect(self.screen, COLOR_WALL, scaled_rect)
-
-        for sprite in self.enemies:
-            scaled_rect = pygame.Rect(sprite.rect.x * scale, sprite.rect.y * scale,
-                                      TILE_SIZE * scale, TILE_SIZE * scale)
-            pygame.draw.rect(self.screen, COLOR_ENEMY, scaled_rect)
-
-        player_scaled = pygame.transform.scale(self.player.image,
-                                               (TILE_SIZE * scale, TILE_SIZE * scale))
-        self.screen.blit(player_scaled, (self.player.rect.x * scale, self.player.rect.y * scale))
+        self.screen.blit(self._bg, (0, 0))
+        self.screen.blits([(self._enemy_surf, pos) for pos in self.enemy_xy.tolist()], doreturn=0)
+        self.screen.blit(self.player.image, self.player.rect.topleft)
 
         pygame.display.flip()
 